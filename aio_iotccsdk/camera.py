@@ -30,16 +30,80 @@ This module contains the high level client APIs.
 
 """
 
+import asyncio
 import base64
+import collections
 import logging
-import os
 from contextlib import asynccontextmanager
+from urllib.parse import urlsplit, urlunsplit
 from .ipcprovider import IpcProvider
 from .frame_iterators import VideoInferenceIterator
 
 DOCKER_IP_PREFIX = "172.17"
 NULL_IP = "0.0.0.0"
 LOOPBACK_IP = "127.0.0.1"
+# Maximum number of logged in sessions kept by `CameraClient.connect`
+SESSION_CACHE_SIZE = 4
+
+# Preview (width, height) in pixels for each supported resolution
+_RES_TABLE = {
+    "4K": (3840, 2160),
+    "1080P": (1920, 1080),
+    "720P": (1280, 720),
+    "480P": (640, 480),
+}
+
+# "/overlayconfig" payloads, only the user text of a text overlay varies
+_INF_OVERLAY_PAYLOAD = {
+    "ov_type_SelectVal": 5,
+    "ov_position_SelectVal": 0,
+    "ov_color": "869007615",
+    "ov_usertext": "Text",
+    "ov_start_x": 0,
+    "ov_start_y": 0,
+    "ov_width": 0,
+    "ov_height": 0
+}
+_TEXT_OVERLAY_TEMPLATE = {
+    "ov_type_SelectVal": 0,
+    "ov_position_SelectVal": 0,
+    "ov_color": "869007615",
+    "ov_start_x": 0,
+    "ov_start_y": 0,
+    "ov_width": 0,
+    "ov_height": 0
+}
+
+# Last successful "/video" response per (ip address, username), used to
+# skip the supported params round trip when connecting again. Bounded
+# like the session cache and cleared by `CameraClient.close_sessions`.
+_SUPPORTED_PARAMS_CACHE = collections.OrderedDict()
+
+
+def _write_snapshot(file_name, data):
+    """
+    Write snapshot bytes to `file_name`.
+
+    This blocks on disk I/O, so it is meant to be run
+    in an executor rather than on the event loop.
+
+    """
+    with open(file_name, "wb") as f:
+        f.write(data)
+
+
+def _cache_supported_params(key, response):
+    """
+    Store a "/video" response in the supported params cache.
+
+    The least recently stored entry is dropped when there are more than
+    `SESSION_CACHE_SIZE` of them.
+
+    """
+    _SUPPORTED_PARAMS_CACHE[key] = response
+    _SUPPORTED_PARAMS_CACHE.move_to_end(key)
+    while len(_SUPPORTED_PARAMS_CACHE) > SESSION_CACHE_SIZE:
+        _SUPPORTED_PARAMS_CACHE.popitem(last=False)
 
 
 class CameraClient():
@@ -81,13 +145,30 @@ class CameraClient():
         This can be configured using `configure_preview` API.
     """
     logger = logging.getLogger("iotccsdk")
+    #: OrderedDict: Logged in `IpcProvider` objects reused by `connect`,
+    #:              keyed by (event loop, ip address, username, password)
+    #:              in LRU order.
+    _session_cache = collections.OrderedDict()
+    #: dict: `asyncio.Lock` serializing the login for each session key.
+    _session_locks = {}
+    #: dict: Number of open `connect` contexts using each cached
+    #:       `IpcProvider`.
+    _session_users = {}
 
     @classmethod
     @asynccontextmanager
-    async def connect(self, ip_address, ipc_provider=None, username=None, password=None):
+    async def connect(cls, ip_address, ipc_provider=None, username=None,
+                      password=None, reuse_session=False):
         """
         This method is used to create CameraClient handle for application.
 
+        With `reuse_session` and no `ipc_provider` the login session is
+        kept after the context exits and reused by later `connect` calls
+        with the same credentials on the same event loop. A reused
+        session is checked with the preview params request and logged
+        in again if the camera no longer accepts it. Use
+        `close_sessions` to log the kept sessions out.
+
         Parameters
         ----------
         ipc_provider : `IpcProvider` object
@@ -98,6 +179,9 @@ class CameraClient():
             username for the camera.
         password : str
             password for the camera.
+        reuse_session : bool
+            Keep the login session for later `connect` calls
+            (the default is False).
 
         Yields
         ------
@@ -105,20 +189,176 @@ class CameraClient():
             `CameraClient` handle for the application.
 
         """
-        if ipc_provider is None:
+        session_key = None
+        if ipc_provider is not None:
+            await ipc_provider.connect()
+        elif reuse_session:
+            session_key = (asyncio.get_event_loop(),
+                           ip_address, username, password)
+            ipc_provider = await cls._get_session(session_key)
+        else:
             ipc_provider = IpcProvider(
                 ip=ip_address, username=username, password=password)
+            await ipc_provider.connect()
 
-        await ipc_provider.connect()
+        camera_client = None
         try:
-            camera_client = CameraClient(ipc_provider)
-            await camera_client._get_supported_params()
+            camera_client = cls(ipc_provider)
+            cached_params = _SUPPORTED_PARAMS_CACHE.get(
+                camera_client._params_cache_key())
+            if session_key is not None:
+                # the params request also tells if the camera still
+                # accepts the reused session
+                if not await camera_client._check_session():
+                    stale = ipc_provider
+                    ipc_provider = await cls._get_session(session_key, stale)
+                    await cls._release_session(session_key, stale)
+                    camera_client = cls(ipc_provider)
+                    await camera_client._get_supported_params()
+            elif cached_params:
+                # use the cached params now and refresh them in the background
+                camera_client._apply_supported_params(cached_params)
+                camera_client._params_refresh = asyncio.ensure_future(
+                    camera_client._refresh_supported_params())
+            else:
+                await camera_client._get_supported_params()
             yield camera_client
         except Exception as e:
-            camera_client.logger.exception(e)
+            cls.logger.exception(e)
+            if (session_key is not None
+                    and cls._session_cache.get(session_key) is ipc_provider):
+                # the session may be broken, log in again next time
+                del cls._session_cache[session_key]
             raise
         finally:
+            if camera_client is not None:
+                if camera_client._params_refresh is not None:
+                    camera_client._params_refresh.cancel()
+                await camera_client._release_iterators()
+            if session_key is None:
+                await ipc_provider.logout()
+            else:
+                await cls._release_session(session_key, ipc_provider)
+
+    @classmethod
+    async def _get_session(cls, session_key, stale=None):
+        """
+        Private method for getting a logged in `IpcProvider`.
+
+        A cached session is reused while it is still logged in, otherwise
+        a new one is logged in and cached. Concurrent calls with the same
+        key share a single login. The least recently used sessions are
+        dropped when there are more than `SESSION_CACHE_SIZE` of them,
+        and logged out once no `connect` context uses them.
+
+        Parameters
+        ----------
+        session_key : tuple
+            (event loop, ip address, username, password) of the camera.
+        stale : `IpcProvider` object
+            Session the camera no longer accepts. It is not reused.
+
+        Returns
+        -------
+        IpcProvider
+            Logged in `IpcProvider` object. It must be handed back with
+            `_release_session`.
+
+        """
+        cls._drop_closed_loops()
+        lock = cls._session_locks.setdefault(session_key, asyncio.Lock())
+        async with lock:
+            ipc_provider = cls._session_cache.get(session_key)
+            if (ipc_provider is not None and ipc_provider is not stale
+                    and ipc_provider.connected):
+                cls._session_cache.move_to_end(session_key)
+            else:
+                _, ip_address, username, password = session_key
+                ipc_provider = IpcProvider(
+                    ip=ip_address, username=username, password=password)
+                await ipc_provider.connect()
+                cls._session_cache[session_key] = ipc_provider
+            cls._session_users[ipc_provider] = (
+                cls._session_users.get(ipc_provider, 0) + 1)
+
+        while len(cls._session_cache) > SESSION_CACHE_SIZE:
+            evicted_key, evicted = cls._session_cache.popitem(last=False)
+            cls._session_locks.pop(evicted_key, None)
+            if evicted not in cls._session_users:
+                await cls._logout_session(evicted)
+        return ipc_provider
+
+    @classmethod
+    async def _release_session(cls, session_key, ipc_provider):
+        """
+        Private method for handing back a session from `_get_session`.
+
+        The session is logged out when it is no longer cached and no other
+        `connect` context uses it.
+
+        Parameters
+        ----------
+        session_key : tuple
+            Key the session was obtained with.
+        ipc_provider : `IpcProvider` object
+            Session returned by `_get_session`.
+
+        """
+        users = cls._session_users.pop(ipc_provider, 1) - 1
+        if users > 0:
+            cls._session_users[ipc_provider] = users
+        elif cls._session_cache.get(session_key) is not ipc_provider:
+            await cls._logout_session(ipc_provider)
+
+    @classmethod
+    def _drop_closed_loops(cls):
+        """
+        Private method for forgetting sessions of closed event loops.
+
+        Their HTTP sessions can not be used or closed from another loop.
+
+        """
+        for session_key in list(cls._session_cache):
+            if session_key[0].is_closed():
+                ipc_provider = cls._session_cache.pop(session_key)
+                cls._session_locks.pop(session_key, None)
+                cls._session_users.pop(ipc_provider, None)
+
+    @classmethod
+    async def _logout_session(cls, ipc_provider):
+        """
+        Private method for logging out a cached session.
+
+        Failures are logged and ignored since the session is dropped anyway.
+
+        """
+        if not ipc_provider.connected:
+            return
+        try:
             await ipc_provider.logout()
+        except Exception as e:
+            cls.logger.warning("Failed to logout cached session: %s", e)
+
+    @classmethod
+    async def close_sessions(cls):
+        """
+        This method logs out the sessions kept by `connect` on the
+        running event loop.
+
+        Sessions still used by a `connect` context are logged out when
+        that context exits. The cached preview params are dropped as well.
+
+        """
+        _SUPPORTED_PARAMS_CACHE.clear()
+        cls._drop_closed_loops()
+        loop = asyncio.get_event_loop()
+        for session_key in list(cls._session_cache):
+            if session_key[0] is not loop:
+                continue
+            ipc_provider = cls._session_cache.pop(session_key)
+            cls._session_locks.pop(session_key, None)
+            if ipc_provider not in cls._session_users:
+                await cls._logout_session(ipc_provider)
 
     def __init__(self, ipc_provider: IpcProvider):
         """
@@ -139,6 +379,20 @@ class CameraClient():
         self.encodetype = []
         self.bitrates = []
         self.framerates = []
+        #: dict: Reverse lookups from supported value to its index,
+        #:       built by `_get_supported_params`.
+        self._res_idx = {}
+        self._enc_idx = {}
+        self._bit_idx = {}
+        self._fps_idx = {}
+        #: dict: `VideoInferenceIterator` objects kept between
+        #:       `get_inferences` calls, keyed by (vam url, width, height).
+        self._iter_pool = {}
+        #: set: Keys of pooled iterators currently being consumed.
+        self._iter_in_use = set()
+        #: asyncio.Task: Pending background refresh of the supported
+        #:               params, see `_wait_params_refresh`.
+        self._params_refresh = None
         self.cur_resolution = ""
         self.cur_codec = ""
         self.cur_bitrate = ""
@@ -163,6 +417,8 @@ class CameraClient():
         EOFError
             If the preview is not started.
             Or if the vam is not started.
+        ValueError
+            If the current preview resolution is not supported.
 
         """
         if not self.preview_running:
@@ -171,34 +427,77 @@ class CameraClient():
         if not self.vam_running:
             raise EOFError("VAM not started")
 
-        if self.cur_resolution == "4K":
-            preview_width = 3840
-            preview_height = 2160
-        elif self.cur_resolution == "1080P":
-            preview_width = 1920
-            preview_height = 1080
-        elif self.cur_resolution == "720P":
-            preview_width = 1280
-            preview_height = 720
-        elif self.cur_resolution == "480P":
-            preview_width = 640
-            preview_height = 480
-
-        inference_iterator = VideoInferenceIterator(
-            preview_width, preview_height)
+        await self._wait_params_refresh()
+
+        if self.cur_resolution not in _RES_TABLE:
+            raise ValueError(
+                "Unsupported resolution: %s" % self.cur_resolution)
+        preview_width, preview_height = _RES_TABLE[self.cur_resolution]
 
+        inference_iterator = None
+        pooled = False
+        results = None
         try:
             if self.vam_url == "":
                 await self._get_vam_info()
-            if NULL_IP in self.vam_url:
-                self.vam_url.replace(NULL_IP, LOOPBACK_IP)
 
-            yield inference_iterator.start(self.vam_url)
+            key = (self.vam_url, preview_width, preview_height)
+            await self._evict_iterators(key)
+            if key in self._iter_in_use:
+                # another context reads the pooled pipeline, use a private one
+                inference_iterator = VideoInferenceIterator(
+                    preview_width, preview_height)
+            else:
+                pooled = True
+                self._iter_in_use.add(key)
+                inference_iterator = self._iter_pool.get(key)
+                if inference_iterator is None:
+                    inference_iterator = VideoInferenceIterator(
+                        preview_width, preview_height)
+                    self._iter_pool[key] = inference_iterator
+
+            results = inference_iterator.start(self.vam_url)
+            yield results
         except Exception as e:
             self.logger.exception(e)
             raise
         finally:
-            inference_iterator.stop()
+            if results is not None:
+                await results.aclose()
+            if pooled:
+                self._iter_in_use.discard(key)
+                if key == self._iter_key():
+                    inference_iterator.pause()
+                else:
+                    self._iter_pool.pop(key, None)
+                    await inference_iterator.stop()
+            elif inference_iterator is not None:
+                await inference_iterator.stop()
+
+    def _iter_key(self):
+        """
+        Private method for getting the inference iterator pool key.
+
+        Returns
+        -------
+        tuple
+            (vam url, preview width, preview height) for the current
+            VA url and preview resolution.
+
+        """
+        return (self.vam_url,) + _RES_TABLE.get(self.cur_resolution, ())
+
+    async def _evict_iterators(self, key):
+        """
+        Private method for stopping pooled iterators that are out of date.
+
+        Idle iterators whose url or size differ from `key` are stopped,
+        e.g. after a resolution change or a new VA url.
+
+        """
+        for other_key in list(self._iter_pool):
+            if other_key != key and other_key not in self._iter_in_use:
+                await self._iter_pool.pop(other_key).stop()
 
     async def configure_preview(self, resolution=None, encode=None,
                           bitrate=None, framerate=None, display_out=None):
@@ -230,26 +529,23 @@ class CameraClient():
             Any exception raised by ipc provider post
 
         """
-        if resolution and self.resolutions and resolution in self.resolutions:
-            res = self.resolutions.index(resolution)
-        else:
-            res = self.resolutions.index(self.cur_resolution)
-        if encode and self.encodetype and encode in self.encodetype:
-            enc = self.encodetype.index(encode)
-        else:
-            enc = self.encodetype.index(self.cur_codec)
-        if bitrate and self.bitrates and bitrate in self.bitrates:
-            bit = self.bitrates.index(bitrate)
-        else:
-            bit = self.bitrates.index(self.cur_bitrate)
-        if framerate and self.framerates and framerate in self.framerates:
-            fps = self.framerates.index(framerate)
-        else:
-            fps = self.framerates.index(self.cur_framerate)
+        await self._wait_params_refresh()
+        res = self._res_idx.get(resolution)
+        if res is None:
+            res = self._res_idx[self.cur_resolution]
+        enc = self._enc_idx.get(encode)
+        if enc is None:
+            enc = self._enc_idx[self.cur_codec]
+        bit = self._bit_idx.get(bitrate)
+        if bit is None:
+            bit = self._bit_idx[self.cur_bitrate]
+        fps = self._fps_idx.get(framerate)
+        if fps is None:
+            fps = self._fps_idx[self.cur_framerate]
 
         if display_out not in [0, 1]:
             self.logger.error(
-                "Invalid value: display_out should 0/1 got: %s" % display_out)
+                "Invalid value: display_out should 0/1 got: %s", display_out)
             display_out = self.display_out
 
         path = "/video"
@@ -264,19 +560,19 @@ class CameraClient():
         if response["status"]:
             if self.cur_resolution != self.resolutions[res]:
                 self.cur_resolution = self.resolutions[res]
-                self.logger.info("resolution now: %s" % self.cur_resolution)
+                self.logger.info("resolution now: %s", self.cur_resolution)
             if self.cur_codec != self.encodetype[enc]:
                 self.cur_codec = self.encodetype[enc]
-                self.logger.info("encodetype now: %s" % self.cur_codec)
+                self.logger.info("encodetype now: %s", self.cur_codec)
             if self.cur_bitrate != self.bitrates[bit]:
                 self.cur_bitrate = self.bitrates[bit]
-                self.logger.info("bitrate now : %s" % self.cur_bitrate)
+                self.logger.info("bitrate now : %s", self.cur_bitrate)
             if self.cur_framerate != self.framerates[fps]:
                 self.cur_framerate = self.framerates[fps]
-                self.logger.info("framerate now: %s" % self.cur_framerate)
+                self.logger.info("framerate now: %s", self.cur_framerate)
             if self.display_out != display_out:
                 self.display_out = display_out
-                self.logger.info("display_out now: %s" % self.display_out)
+                self.logger.info("display_out now: %s", self.display_out)
         return response["status"]
 
     async def _get_supported_params(self):
@@ -296,34 +592,119 @@ class CameraClient():
         payload = {}
         response = await self.ipc_provider.get(path, payload)
         if response["status"]:
-            self.resolutions = response["resolution"]
-            r_idx = response["resolutionSelectVal"]
-            self.cur_resolution = self.resolutions[r_idx]
-            self.encodetype = response["encodeMode"]
-            e_idx = response["encodeModeSelectVal"]
-            self.cur_codec = self.encodetype[e_idx]
-            self.bitrates = response["bitRate"]
-            b_idx = response["bitRateSelectVal"]
-            self.cur_bitrate = self.bitrates[b_idx]
-            self.framerates = response["fps"]
-            f_idx = response["fpsSelectVal"]
-            self.cur_framerate = self.framerates[f_idx]
-            self.display_out = response["displayOut"]
-
-            self.logger.info("resolutions: %s" % self.resolutions)
-            self.logger.info("encodetype: %s" % self.encodetype)
-            self.logger.info("bitrates: %s" % self.bitrates)
-            self.logger.info("framerates: %s" % self.framerates)
-
-            self.logger.info("Current preview settings:")
-            self.logger.info("resolution: %s" % self.cur_resolution)
-            self.logger.info("encodetype: %s" % self.cur_codec)
-            self.logger.info("bitrate: %s" % self.cur_bitrate)
-            self.logger.info("framerate: %s" % self.cur_framerate)
-            self.logger.info("display_out: %s" % self.display_out)
+            _cache_supported_params(self._params_cache_key(), response)
+            self._apply_supported_params(response)
 
         return response["status"]
 
+    def _apply_supported_params(self, response):
+        """
+        Private method for populating preview params from a response.
+
+        Parameters
+        ----------
+        response : dict
+            Successful response of the "/video" GET call.
+
+        """
+        old_params = self._params_snapshot()
+        # copy the lists, the response may be shared through the cache
+        self.resolutions = list(response["resolution"])
+        r_idx = response["resolutionSelectVal"]
+        self.cur_resolution = self.resolutions[r_idx]
+        self.encodetype = list(response["encodeMode"])
+        e_idx = response["encodeModeSelectVal"]
+        self.cur_codec = self.encodetype[e_idx]
+        self.bitrates = list(response["bitRate"])
+        b_idx = response["bitRateSelectVal"]
+        self.cur_bitrate = self.bitrates[b_idx]
+        self.framerates = list(response["fps"])
+        f_idx = response["fpsSelectVal"]
+        self.cur_framerate = self.framerates[f_idx]
+        self.display_out = response["displayOut"]
+
+        self._res_idx = {v: i for i, v in enumerate(self.resolutions)}
+        self._enc_idx = {v: i for i, v in enumerate(self.encodetype)}
+        self._bit_idx = {v: i for i, v in enumerate(self.bitrates)}
+        self._fps_idx = {v: i for i, v in enumerate(self.framerates)}
+
+        if self._params_snapshot() == old_params:
+            return
+        self.logger.info("resolutions: %s", self.resolutions)
+        self.logger.info("encodetype: %s", self.encodetype)
+        self.logger.info("bitrates: %s", self.bitrates)
+        self.logger.info("framerates: %s", self.framerates)
+
+        self.logger.info("Current preview settings:")
+        self.logger.info("resolution: %s", self.cur_resolution)
+        self.logger.info("encodetype: %s", self.cur_codec)
+        self.logger.info("bitrate: %s", self.cur_bitrate)
+        self.logger.info("framerate: %s", self.cur_framerate)
+        self.logger.info("display_out: %s", self.display_out)
+
+    def _params_snapshot(self):
+        """
+        Private method for getting the preview params as a tuple.
+
+        """
+        return (self.resolutions, self.encodetype, self.bitrates,
+                self.framerates, self.cur_resolution, self.cur_codec,
+                self.cur_bitrate, self.cur_framerate, self.display_out)
+
+    def _params_cache_key(self):
+        """
+        Private method for getting the supported params cache key.
+
+        """
+        return (self.ipc_provider.ip_address, self.ipc_provider.username)
+
+    async def _check_session(self):
+        """
+        Private method for checking a reused login session.
+
+        The preview params are fetched with the session, so a session
+        the camera still accepts is ready to use afterwards.
+
+        Returns
+        -------
+        bool
+            True if the camera accepted the session. False otherwise.
+
+        """
+        try:
+            return await self._get_supported_params()
+        except Exception as e:
+            self.logger.warning("Reused session was rejected: %s", e)
+            return False
+
+    async def _refresh_supported_params(self):
+        """
+        Private method for refreshing cached preview params.
+
+        On failure the cached params are dropped, so the next `connect`
+        fetches them before use.
+
+        """
+        try:
+            if await self._get_supported_params():
+                return
+            self.logger.warning("Failed to refresh preview params")
+        except Exception as e:
+            self.logger.warning("Failed to refresh preview params: %s", e)
+        _SUPPORTED_PARAMS_CACHE.pop(self._params_cache_key(), None)
+
+    async def _wait_params_refresh(self):
+        """
+        Private method for waiting on a pending preview params refresh.
+
+        This makes sure the current preview settings are up to date
+        before they are used.
+
+        """
+        if self._params_refresh is not None:
+            refresh, self._params_refresh = self._params_refresh, None
+            await refresh
+
     async def set_preview_state(self, state):
         """
         This is a switch for preview.
@@ -346,7 +727,7 @@ class CameraClient():
         elif state.lower() == "off":
             status = False
         else:
-            self.logger.error("Invalid state: %s should be on/off" % state)
+            self.logger.error("Invalid state: %s should be on/off", state)
         path = "/preview"
         payload = {"switchStatus": status}
         response = await self.ipc_provider.post(path, payload)
@@ -368,19 +749,43 @@ class CameraClient():
         payload = {}
         response = await self.ipc_provider.get(path, payload)
         if "url" in response:
-            url = response["url"]
-            e_idx = url.rindex(":")
-            # don't modify the url if we are using the docker ip
-            if DOCKER_IP_PREFIX not in self.ipc_provider.ip_address:
-                url = "rtsp://%s%s" % (
-                    self.ipc_provider.ip_address, url[e_idx:])
-            self.preview_url = url
+            self.preview_url = self._rewrite_rtsp(response["url"])
         else:
             self.preview_url = None
-        self.logger.info("preview url: %s" % self.preview_url)
+        self.logger.info("preview url: %s", self.preview_url)
         self.preview_running = response["status"]
         return self.preview_url
 
+    def _rewrite_rtsp(self, url):
+        """
+        Private method for pointing a camera RTSP url at the camera IP.
+
+        The webserver reports stream urls with its own view of the host,
+        so the host is replaced with the IP address used to reach the
+        camera. Port, path and any user info are kept.
+
+        Parameters
+        ----------
+        url : str
+            RTSP url reported by the camera.
+
+        Returns
+        -------
+        str
+            RTSP url for the camera IP address.
+
+        """
+        ip_address = self.ipc_provider.ip_address
+        # don't modify the url if we are using the docker ip
+        if ip_address.startswith(DOCKER_IP_PREFIX):
+            return url
+        parts = urlsplit(url)
+        host = "[%s]" % ip_address if ":" in ip_address else ip_address
+        if parts.port is not None:
+            host = "%s:%d" % (host, parts.port)
+        userinfo, sep, _ = parts.netloc.rpartition("@")
+        return urlunsplit(parts._replace(netloc=userinfo + sep + host))
+
     async def set_analytics_state(self, state):
         """
         This is a switch for video analytics(VA).
@@ -403,7 +808,7 @@ class CameraClient():
         elif state.lower() == "off":
             status = False
         else:
-            self.logger.error("Invalid state: %s should be on/off" % state)
+            self.logger.error("Invalid state: %s should be on/off", state)
         payload = {"switchStatus": status, "vamconfig": "MD"}
         path = "/vam"
         response = await self.ipc_provider.post(path, payload)
@@ -424,20 +829,17 @@ class CameraClient():
         path = "/vam"
         payload = {}
         response = await self.ipc_provider.get(path, payload)
-        self.logger.info("RESPONSE: %s: " % response)
+        self.logger.info("RESPONSE: %s: ", response)
         if "url" in response:
-            url = response["url"]
-            e_idx = url.rindex(":")
-            # don't modify the url if we are using the docker ip
-            if DOCKER_IP_PREFIX not in self.ipc_provider.ip_address:
-                url = "rtsp://%s%s" % (
-                    self.ipc_provider.ip_address, url[e_idx:])
+            url = self._rewrite_rtsp(response["url"])
+            if NULL_IP in url:
+                url = url.replace(NULL_IP, LOOPBACK_IP)
             self.vam_url = url
         else:
             self.vam_url = None
 
         self.vam_running = response["status"]
-        self.logger.info("vam url: %s" % self.vam_url)
+        self.logger.info("vam url: %s", self.vam_url)
         return self.vam_url
 
     async def set_recording_state(self, state):
@@ -462,7 +864,7 @@ class CameraClient():
         elif state.lower() == "off":
             status = False
         else:
-            self.logger.error("Invalid state: %s should be on/off" % state)
+            self.logger.error("Invalid state: %s should be on/off", state)
         path = "/recording"
         payload = {"switchStatus": status}
         response = await self.ipc_provider.post(path, payload)
@@ -506,17 +908,7 @@ class CameraClient():
 
         """
         path = "/overlayconfig"
-        payload = {
-            "ov_type_SelectVal": 5,
-            "ov_position_SelectVal": 0,
-            "ov_color": "869007615",
-            "ov_usertext": "Text",
-            "ov_start_x": 0,
-            "ov_start_y": 0,
-            "ov_width": 0,
-            "ov_height": 0
-        }
-        response = await self.ipc_provider.post(path, payload)
+        response = await self.ipc_provider.post(path, _INF_OVERLAY_PAYLOAD)
         return response["status"]
 
     async def _configure_text_overlay(self, text):
@@ -533,16 +925,7 @@ class CameraClient():
 
         """
         path = "/overlayconfig"
-        payload = {
-            "ov_type_SelectVal": 0,
-            "ov_position_SelectVal": 0,
-            "ov_color": "869007615",
-            "ov_usertext": text,
-            "ov_start_x": 0,
-            "ov_start_y": 0,
-            "ov_width": 0,
-            "ov_height": 0
-        }
+        payload = dict(_TEXT_OVERLAY_TEMPLATE, ov_usertext=text)
         response = await self.ipc_provider.post(path, payload)
         return response["status"]
 
@@ -568,23 +951,29 @@ class CameraClient():
         elif state.lower() == "off":
             status = False
         else:
-            self.logger.error("Invalid state: %s should be on/off" % state)
+            self.logger.error("Invalid state: %s should be on/off", state)
         path = "/overlay"
         payload = {"switchStatus": status}
         response = await self.ipc_provider.post(path, payload)
         return response["status"]
 
-    async def captureimage(self):
+    async def captureimage(self, store=False):
         """
         This method is for taking a snapshot.
 
-        The snapshot is taken and stored as snapshot_<timestamp>.jpg
-        when the call is successful.
+        When `store` is set the snapshot is also stored as
+        snapshot_<timestamp>.jpg in the current working directory.
+
+        Parameters
+        ----------
+        store : bool, optional
+            Store the snapshot on disk (the default is False).
 
         Returns
         -------
-        bool
-            True if the request was successful. False on failure.
+        bytes
+            JPEG data if the request was successful.
+            None on failure.
 
         """
         path = "/captureimage"
@@ -594,13 +983,16 @@ class CameraClient():
             self.logger.error(response["Error"])
             return None
 
-        # file_name = "snapshot_%s.jpg" % response["Timestamp"]
-        # dir_name = os.path.dirname(os.path.abspath(__name__))
-        # full_file_name = os.path.join(dir_name, file_name)
-        # self.logger.info("Storing snapshot: %s" % full_file_name)
-        # with open(file_name, "wb") as f:
-        #     f.write(base64.b64decode(response["Data"]))
-        return response["Data"]
+        # take the payload out of the response so that the encoded image
+        # is released as soon as it is decoded
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(
+            None, base64.b64decode, response.pop("Data"))
+        if store:
+            file_name = "snapshot_%s.jpg" % response["Timestamp"]
+            self.logger.info("Storing snapshot: %s", file_name)
+            await loop.run_in_executor(None, _write_snapshot, file_name, data)
+        return data
 
     async def logout(self):
         """
@@ -612,5 +1004,16 @@ class CameraClient():
             True if the request was successful. False on failure.
 
         """
+        await self._release_iterators()
         status = await self.ipc_provider.logout()
         return status
+
+    async def _release_iterators(self):
+        """
+        Private method for stopping the pooled inference iterators.
+
+        """
+        iterators = list(self._iter_pool.values())
+        self._iter_pool.clear()
+        for inference_iterator in iterators:
+            await inference_iterator.stop()
@@ -29,12 +29,16 @@
 This module provides iterator for getting frame and inference.
 """
 
+import asyncio
 import json
 import logging
 import os
 import subprocess
 import sys
 
+# Seconds to wait for gstreamer to exit after terminate before killing it
+STOP_TIMEOUT = 5
+
 
 class CameraInference(object):
     """
@@ -130,28 +134,45 @@ class VideoInferenceIterator(object):
     preview_height: int
         Preview stream height. This is required for object location
         calculation.
+    idle_timeout: float
+        Seconds a paused pipeline is kept running before it is stopped.
 
     """
 
-    def __init__(self, preview_width, preview_height):
+    def __init__(self, preview_width, preview_height, idle_timeout=30):
         """
         This is the constructor for `VideoInferenceIterator` class.
 
         """
         self.preview_width = preview_width
         self.preview_height = preview_height
+        self.idle_timeout = idle_timeout
         #: str: Holds the JSON inference metadata obtained from the camera
         self._json_str = ""
-        #: subprocess: object where gstreamer pipeline for capture inference
-        #:             stream is run.
+        #: asyncio.subprocess.Process: object where gstreamer pipeline for
+        #:                             capture inference stream is run.
         self._sub_proc = None
+        #: str: VA RTSP stream url the gstreamer pipeline is reading.
+        self._result_src = None
+        #: int: Offset of the metadata in a gstreamer dump line.
+        self._data_idx = 0
+        #: asyncio.Lock: Serializes starting the gstreamer pipeline.
+        self._lock = asyncio.Lock()
+        #: bool: Set while a `start` generator is being consumed.
+        self._reading = False
+        #: asyncio.Task: Discards pipeline output while paused.
+        self._drainer = None
         self.logger = logging.getLogger('iotccsdk')
 
-    def start(self, result_src):
+    async def start(self, result_src):
         """
-        This is the inference generator method
+        This is the asynchronous inference generator method
 
         It gets inferences from the RTSP VA stream from the camera.
+        The stream is read without blocking the event loop, so it is
+        consumed with ``async for``. If the pipeline for `result_src` is
+        still running after `pause`, it is reused. Only one generator
+        can be consumed at a time.
 
         Parameters
         ----------
@@ -166,68 +187,199 @@ class VideoInferenceIterator(object):
 
         Raises
         ------
+        RuntimeError
+            If another generator of this object is being consumed.
         Exception
             Any exception that occurs during inference handling.
 
         """
-        cmd = ['gst-launch-1.0 ',
-               ' -q ',
-               ' rtspsrc ',
-               ' location=%s' % result_src,
-               ' protocols=tcp ',
-               ' ! ',
-               ' application/x-rtp, media=application ',
-               ' ! ',
-               ' fakesink ',
-               ' dump=true']
-        cmd = ''.join(cmd)
-        self.logger.info('result_src: %s' % result_src)
-        self.logger.info('gstreamer cmd: %s' % str(cmd))
+        if self._reading:
+            raise RuntimeError("inference stream is already being consumed")
+
+        # run gst-launch directly rather than through a shell, so that
+        # `stop` terminates the pipeline itself and not just the shell
+        cmd = ['gst-launch-1.0',
+               '-q',
+               'rtspsrc',
+               'location=%s' % result_src,
+               'protocols=tcp',
+               '!',
+               'application/x-rtp, media=application',
+               '!',
+               'fakesink',
+               'dump=true']
+        self.logger.info('result_src: %s', result_src)
+        self.logger.info('gstreamer cmd: %s', ' '.join(cmd))
         platform = sys.platform
         platform = platform.lower()
-        self.logger.info('Platform: %s' % platform)
+        self.logger.info('Platform: %s', platform)
         if 'win' in platform:
-            data_idx = 78
+            self._data_idx = 78
         elif 'linux' in platform:
-            data_idx = 72
+            self._data_idx = 72
 
+        self._reading = True
         try:
-            self._sub_proc = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE,
-                                              stderr=subprocess.PIPE, bufsize=1,
-                                              universal_newlines=True)
-            for line in self._sub_proc.stdout:
-                if 'ERROR' in line or 'error' in line:
-                    raise Exception(line)
-                l_str = line[data_idx:]
-                l_str = l_str.strip(os.linesep)
-                self.logger.debug(l_str)
-                if ":[" in self._json_str and "] }" in self._json_str + l_str:
-                    # Only yield if objects are present in the inferences
-                    self._json_str = self._json_str + l_str
-                    s_idx = self._json_str.index('{ "')
-                    e_idx = self._json_str.index("] }") + 3
-                    self._json_str = self._json_str[s_idx:e_idx]
-                    self.logger.debug(self._json_str)
-                    result = self._get_inference_result()
+            async with self._lock:
+                await self._cancel_drainer()
+                if (self._sub_proc is None
+                        or self._sub_proc.stdout.at_eof()
+                        or self._result_src != result_src):
+                    await self.stop()
                     self._json_str = ""
+                    self._result_src = result_src
+                    self._sub_proc = await asyncio.create_subprocess_exec(
+                        *cmd, stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE)
+                sub_proc = self._sub_proc
+            async for line in sub_proc.stdout:
+                result = self._parse_line(line)
+                if result is not None:
                     yield result
-                elif (":[" not in self._json_str
-                      and '{ "' in self._json_str
-                      and " }" in self._json_str + l_str):
-                    self._json_str = ""
-                else:
-                    self._json_str = self._json_str + l_str
         except (Exception, subprocess.CalledProcessError) as e:
             self.logger.exception(e)
+            await self.stop()
+            raise
+        finally:
+            self._reading = False
+
+    def _parse_line(self, line):
+        """
+        Private method for feeding one line of gstreamer output.
+
+        Parameters
+        ----------
+        line : bytes
+            Line of the gstreamer metadata dump.
+
+        Returns
+        -------
+        CameraInference
+            `CameraInference` object when the line completes an inference
+            with objects, None otherwise.
+
+        Raises
+        ------
+        Exception
+            If gstreamer reports an error.
+
+        """
+        line = line.decode()
+        if 'ERROR' in line or 'error' in line:
+            raise Exception(line)
+        l_str = line[self._data_idx:]
+        l_str = l_str.strip(os.linesep)
+        self.logger.debug(l_str)
+        if ":[" in self._json_str and "] }" in self._json_str + l_str:
+            # Only yield if objects are present in the inferences
+            self._json_str = self._json_str + l_str
+            s_idx = self._json_str.index('{ "')
+            e_idx = self._json_str.index("] }") + 3
+            self._json_str = self._json_str[s_idx:e_idx]
+            self.logger.debug(self._json_str)
+            result = self._get_inference_result()
+            self._json_str = ""
+            return result
+        elif (":[" not in self._json_str
+              and '{ "' in self._json_str
+              and " }" in self._json_str + l_str):
+            self._json_str = ""
+        else:
+            self._json_str = self._json_str + l_str
+        return None
+
+    def pause(self):
+        """
+        This method pauses the inference generator.
+
+        The gstreamer pipeline is left running so that the next `start`
+        with the same url does not have to set up a new RTSP session.
+        While paused its output is read and discarded, so the pipeline
+        does not stall and no stale inferences are returned on resume.
+        The pipeline is stopped after `idle_timeout` seconds.
+
+        """
+        if self._sub_proc is None or self._drainer is not None:
+            return
+        self.logger.debug('Pausing inference generator for %s',
+                          self._result_src)
+        self._drainer = asyncio.ensure_future(self._drain(self._sub_proc))
+
+    async def _drain(self, sub_proc):
+        """
+        Private method for discarding pipeline output while paused.
+
+        The pipeline is stopped on idle timeout, end of stream or error.
+        Cancelling the task resumes without stopping it.
+
+        """
+        try:
+            await asyncio.wait_for(self._discard_output(sub_proc),
+                                   self.idle_timeout)
+        except asyncio.TimeoutError:
+            self.logger.info('Stopping idle inference pipeline for %s',
+                             self._result_src)
+        except asyncio.CancelledError:
             raise
+        except Exception as e:
+            self.logger.exception(e)
+        if self._sub_proc is sub_proc:
+            self._drainer = None
+            await self.stop()
 
-    def stop(self):
+    async def _discard_output(self, sub_proc):
+        """
+        Private method for reading and dropping pipeline output.
+
+        Lines are still parsed so that a resumed `start` continues on
+        an inference boundary.
+
+        """
+        async for line in sub_proc.stdout:
+            self._parse_line(line)
+
+    async def _cancel_drainer(self):
+        """
+        Private method for stopping the output drain of `pause`.
+
+        """
+        drainer, self._drainer = self._drainer, None
+        if drainer is not None and not drainer.done():
+            drainer.cancel()
+            try:
+                await drainer
+            except asyncio.CancelledError:
+                pass
+
+    async def stop(self):
         """
         This method stops the inference generator.
 
+        The gstreamer process is terminated and waited for. It is killed
+        if it does not exit within `STOP_TIMEOUT` seconds.
+
         """
-        if self._sub_proc:
-            self._sub_proc.terminate()
+        drainer, self._drainer = self._drainer, None
+        if drainer is not None and drainer is not asyncio.current_task():
+            drainer.cancel()
+        sub_proc, self._sub_proc = self._sub_proc, None
+        if sub_proc is None:
+            return
+        if sub_proc.returncode is None:
+            try:
+                sub_proc.terminate()
+            except ProcessLookupError:
+                pass
+        try:
+            await asyncio.wait_for(sub_proc.wait(), STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.logger.warning('gstreamer did not exit, killing pid %s',
+                                sub_proc.pid)
+            try:
+                sub_proc.kill()
+            except ProcessLookupError:
+                pass
+            await sub_proc.wait()
 
     def _get_inference_result(self):
         """
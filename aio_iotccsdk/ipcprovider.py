@@ -71,8 +71,19 @@ class IpcProvider():
         #:      camera/QMMF IPC webserver .
         self._session_token = None
         self._heartbeat_manager = None
+        #: aiohttp.ClientSession: HTTP session shared by all requests
+        #:                        between `connect` and `logout`.
+        self._session = None
         self.logger = logging.getLogger("iotccsdk")
 
+    @property
+    def connected(self):
+        """
+        bool: True while logged in to the QMMF IPC webserver.
+
+        """
+        return self._session_token is not None
+
     def _show_error(self, err_msg):
         """
         Private method for logging error messages.
@@ -96,6 +107,32 @@ class IpcProvider():
         """
         return traceback.extract_stack(None, 2)[0][2]
 
+    def _get_session(self):
+        """
+        Private method for getting the shared HTTP session.
+
+        The session is created on first use and kept open until `logout`
+        so that requests reuse keep-alive connections to the webserver.
+
+        Returns
+        -------
+        aiohttp.ClientSession
+            Session used for requests to QMMF IPC webserver.
+
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def _close_session(self):
+        """
+        Private method for closing the shared HTTP session.
+
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
     def _build_url(self, api_path):
         """
         Private method for constructing request url.
@@ -204,18 +241,18 @@ class IpcProvider():
 
         url = self._build_url(path)
         headers = {"Cookie": self._session_token}
-        self.logger.info("API: %s data %s" % (url, payload))
+        self.logger.info("API: %s data %s", url, payload)
         try:
-            async with aiohttp.ClientSession() as mysession:
-                response: aiohttp.ClientResponse
-                async with mysession.request(method.lower(), url, json=payload, headers=headers, params=params) as response:
-                    if response.ok:
-                        self.logger.info("RESPONSE: %s" % response.text)
-
-                    result = await response.json()
-                    if "status" not in result and "Status" not in result:
-                        raise ConnectionError(
-                            f"Call with method: {method} to: {url} returned malformed response: {response}")
+            mysession = self._get_session()
+            response: aiohttp.ClientResponse
+            async with mysession.request(method.lower(), url, json=payload, headers=headers, params=params) as response:
+                if response.ok:
+                    self.logger.info("RESPONSE: %s", response.text)
+
+                result = await response.json()
+                if "status" not in result and "Status" not in result:
+                    raise ConnectionError(
+                        f"Call with method: {method} to: {url} returned malformed response: {response}")
             return result
         except Exception as e:
             self.logger.exception(e)
@@ -247,26 +284,27 @@ class IpcProvider():
             # This is to clear out previous session before starting a new one
             await self.logout()
 
-        async with aiohttp.ClientSession() as mysession:
-            try:
-                url = self._build_url(LOGIN_PATH)
-                payload = {"username": self.username, "userpwd": self.password}
-                self.logger.info("API: %s data: %s" % (url, payload))
-                async with mysession.post(url, json=payload) as response:
-                    self.logger.info("Login response: %s" % response.text)
-                    result = await response.json()
-                    if "status" in result and result["status"]:
-                        self._session_token = response.headers["Set-Cookie"]
-                        self.logger.info(
-                            "connection established with session token: [%s]" % self._session_token)
-                        self._heartbeat_manager = HeartBeatManager(mysession)
-                        return True
-                    else:
-                        raise ConnectionError(
-                            "Failed to connect. Server returned status=False")
-            except Exception as e:
-                self.logger.exception(e)
-                raise
+        mysession = self._get_session()
+        try:
+            url = self._build_url(LOGIN_PATH)
+            payload = {"username": self.username, "userpwd": self.password}
+            self.logger.info("API: %s data: %s", url, payload)
+            async with mysession.post(url, json=payload) as response:
+                self.logger.info("Login response: %s", response.text)
+                result = await response.json()
+                if "status" in result and result["status"]:
+                    self._session_token = response.headers["Set-Cookie"]
+                    self.logger.info(
+                        "connection established with session token: [%s]", self._session_token)
+                    self._heartbeat_manager = HeartBeatManager(mysession)
+                    return True
+                else:
+                    raise ConnectionError(
+                        "Failed to connect. Server returned status=False")
+        except Exception as e:
+            self.logger.exception(e)
+            await self._close_session()
+            raise
 
     async def logout(self):
         """
@@ -295,6 +333,9 @@ class IpcProvider():
         except Exception as e:
             self.logger.exception(e)
             raise
+        finally:
+            self._session_token = None
+            await self._close_session()
 
 
 class HeartBeatManager():
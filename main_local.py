@@ -1,9 +1,16 @@
 import asyncio
+import collections
 import sys
 import time
 import json
 from aio_iotccsdk.camera import CameraClient
 
+try:
+    from orjson import dumps as json_dumps
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+
 SET_STATE_ON = "on"
 SET_STATE_OFF = "off"
 
@@ -17,6 +24,14 @@ delay_interval_secs = 5
 should_capture_images = True
 cap_min_confidence = 50
 cap_max_confidence = 70
+# junk characters the camera leaves around labels
+label_strip_chars = " .\t\n"
+max_pending_captures = 16
+max_concurrent_captures = 2
+# stop capturing for a while when the camera keeps failing snapshots
+breaker_max_failures = 3
+breaker_window_secs = 10
+breaker_open_secs = 30
 
 
 async def main():
@@ -50,47 +65,167 @@ async def configure_camera(camera_client: CameraClient):
     await camera_client.set_analytics_state(SET_STATE_ON)
     print(camera_client.vam_url)
 
-    # configure overlay and start it
-    await camera_client.configure_overlay(overlay_config)
-    await camera_client.set_overlay_state(SET_STATE_ON)
+    # configure overlay and start it, the two calls are independent
+    await asyncio.gather(camera_client.configure_overlay(overlay_config),
+                         camera_client.set_overlay_state(SET_STATE_ON))
 
 
 async def print_inferences(camera_client: CameraClient):
+    # captures run in the background so they don't stall inference reading
+    capturer = BackgroundCapturer(camera_client)
+    capturer.start()
+    try:
+        await read_inferences(camera_client, capturer)
+    finally:
+        await capturer.close()
+
+
+async def read_inferences(camera_client: CameraClient, capturer):
     async with camera_client.get_inferences() as results:
-        last_time = time.time()
-        for result in results:
-            if time.time() - last_time > delay_interval_secs:
-                for inf_obj in result.objects:
-                    inference = Inference(inf_obj)
-                    if cap_min_confidence < inference.confidence < cap_max_confidence:
-                        await capture_image(camera_client)
-                
-                    print(inference.to_json())
-                    last_time = time.time()
+        next_deadline = time.monotonic() + delay_interval_secs
+        async for result in results:
+            now = time.monotonic()
+            if now >= next_deadline:
+                inferences = [Inference(inf_obj) for inf_obj in result.objects or ()]
+                hits = [inference for inference in inferences
+                        if cap_min_confidence < inference.confidence < cap_max_confidence]
+                if should_capture_images:
+                    for _ in hits:
+                        capturer.submit()
+
+                if inferences:
+                    # flush pending text output so the raw write stays in order
+                    sys.stdout.flush()
+                    sys.stdout.buffer.write(b"\n".join(inference.to_json() for inference in inferences) + b"\n")
+                    next_deadline = now + delay_interval_secs
 
 
 async def capture_image(camera_client: CameraClient):
     if not should_capture_images:
         print("capture image skipped")
-        return
-    if not await camera_client.captureimage():
+        return None
+    data = await camera_client.captureimage()
+    if not data:
         print("capture image failed")
+    return data
+
+
+class BackgroundCapturer:
+    """
+    Runs capture requests in the background.
+
+    Requests are queued and a worker starts each one as its own task as
+    soon as one of the `max_concurrent_captures` slots is free, so a slow
+    capture never holds up the ones behind it. Requests are dropped
+    rather than queued when `max_pending_captures` are already waiting
+    or while the circuit breaker is open, so a slow camera can't back up
+    inference reading.
+    """
+
+    def __init__(self, camera_client: CameraClient):
+        self.camera_client = camera_client
+        self._queue = asyncio.Queue(maxsize=max_pending_captures)
+        self._capture_sem = asyncio.Semaphore(max_concurrent_captures)
+        self._breaker = CircuitBreaker(breaker_max_failures,
+                                       breaker_window_secs,
+                                       breaker_open_secs)
+        self._tasks = set()
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.ensure_future(self._run())
+
+    def submit(self):
+        """Queue a capture unless it has to be dropped."""
+        if not self._breaker.allow():
+            return
+        if self._queue.full():
+            print("capture queue full, capture skipped")
+            return
+        self._queue.put_nowait(True)
+
+    async def close(self):
+        """Run the captures already queued, then stop the worker."""
+        if self._worker is not None:
+            await self._queue.put(None)
+            await self._worker
+            self._worker = None
+
+    async def _run(self):
+        while await self._queue.get() is not None:
+            # wait for a free slot before taking the next request, so the
+            # queue limit keeps applying while captures are slow
+            await self._capture_sem.acquire()
+            task = asyncio.ensure_future(self._capture())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        await asyncio.gather(*self._tasks)
+
+    async def _capture(self):
+        try:
+            # drop captures queued before the breaker opened
+            if not self._breaker.allow():
+                return
+            try:
+                data = await capture_image(self.camera_client)
+            except Exception as e:
+                print("capture image failed: %s" % e)
+                self._breaker.record_failure()
+                return
+            if not data:
+                self._breaker.record_failure()
+        finally:
+            self._capture_sem.release()
+
+
+class CircuitBreaker:
+    """
+    Opens for `open_secs` once more than `max_failures` failures
+    happen within `window_secs`.
+    """
+
+    def __init__(self, max_failures, window_secs, open_secs):
+        self.max_failures = max_failures
+        self.window_secs = window_secs
+        self.open_secs = open_secs
+        self._failures = collections.deque()
+        self._open_until = 0.0
+
+    def allow(self):
+        return time.monotonic() >= self._open_until
+
+    def record_failure(self):
+        now = time.monotonic()
+        if now < self._open_until:
+            # already open, failures of calls still in flight don't count
+            return
+        self._failures.append(now)
+        while self._failures[0] <= now - self.window_secs:
+            self._failures.popleft()
+        if len(self._failures) > self.max_failures:
+            self._failures.clear()
+            self._open_until = now + self.open_secs
+            print("too many capture failures, skipping captures for %s secs"
+                  % self.open_secs)
 
 
 class Inference:
+    __slots__ = ("id", "label", "confidence", "position_x", "position_y",
+                 "width", "height")
 
     def __init__(self, inference_object):
+        position = inference_object.position
         self.id = inference_object.id
         # remove junk final character from the label
-        self.label = inference_object.label.strip(" .\t\n")
+        self.label = inference_object.label.strip(label_strip_chars)
         self.confidence = inference_object.confidence
-        self.position_x = inference_object.position.x
-        self.position_y = inference_object.position.y
-        self.width = inference_object.position.width
-        self.height = inference_object.position.height
+        self.position_x = position.x
+        self.position_y = position.y
+        self.width = position.width
+        self.height = position.height
 
     def to_json(self):
-        return json.dumps(self.__dict__)
+        return json_dumps({slot: getattr(self, slot) for slot in self.__slots__})
 
 
 if __name__ == '__main__':
@@ -52,7 +52,7 @@ setup_args = {
     'long_description_content_type': 'text/markdown',
     'url': PROJECT_URL,
     'include_package_data': True,
-    'python_requires': '~=3.5',
+    'python_requires': '>=3.7',
     'install_requires': [
         DEPENDENCIES
     ],
@@ -75,7 +75,7 @@ setup_args = {
         'Topic :: Multimedia :: Video',
         'Topic :: Scientific/Engineering :: Artificial Intelligence',
         'Topic :: Software Development',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3.7',
     ],
     'project_urls': {
         'Vision AI DevKit Page': 'https://azure.github.io/Vision-AI-DevKit-Pages/',